@@ -1,95 +1,143 @@
 """
 Shared helpers for Jobs Kenya Vercel API — uses Neon Postgres
 """
-import re, json, os, requests
+import re, os, gzip, time, hashlib, pathlib, tempfile, asyncio, orjson, ahocorasick
+from contextlib import contextmanager, nullcontext
+from io import BytesIO
 from datetime import datetime
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 
 # ── NEON POSTGRES CONNECTION ─────────────────────────────────────
-# Vercel auto-adds POSTGRES_URL when you connect Neon
+# Vercel auto-adds POSTGRES_URL when you connect Neon (prefer the -pooler host)
 DATABASE_URL = os.getenv('POSTGRES_URL', '')
+JOB_COLUMNS  = ('id,title,company,location,county,type,sector,salary,deadline,'
+                'link,apply_email,description,source,scraped_at')
 
-def get_conn():
-    """Get a Postgres connection"""
+POOL_PING_AFTER = 30  # seconds idle before a borrowed connection is checked
+
+_POOL      = None
+_LAST_USED = {}  # id(conn) -> when it was last returned to the pool
+
+def _live_conn():
+    """A pooled connection that answers; Neon drops idle ones on auto-suspend.
+    Newly opened connections have no _LAST_USED entry and are used as is."""
     import psycopg2
-    return psycopg2.connect(DATABASE_URL, sslmode='require')
+    while True:
+        conn = _POOL.getconn()
+        last = _LAST_USED.get(id(conn))
+        if last is None or time.time() - last < POOL_PING_AFTER:
+            return conn
+        try:
+            with conn.cursor() as cur:
+                cur.execute('SELECT 1')
+            return conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Others idle since the same suspend may be dead too; keep going
+            _LAST_USED.pop(id(conn), None)
+            _POOL.putconn(conn, close=True)
+
+@contextmanager
+def get_conn():
+    """Borrow a pooled Postgres connection; warm instances skip TLS + auth"""
+    global _POOL
+    if _POOL is None:
+        from psycopg2.pool import ThreadedConnectionPool
+        _POOL = ThreadedConnectionPool(1, 4, dsn=DATABASE_URL, sslmode='require')
+    conn = _live_conn()
+    try:
+        yield conn
+    finally:
+        # The pool rolls back anything left open; dead connections (and
+        # spares above minconn) are closed, and forgotten here too
+        _POOL.putconn(conn, close=bool(conn.closed))
+        if conn.closed: _LAST_USED.pop(id(conn), None)
+        else:           _LAST_USED[id(conn)] = time.time()
+
+_DB_INIT_DONE = False
 
 def init_db():
-    """Create jobs table if it doesn't exist"""
+    """Create jobs table if it doesn't exist (once per warm instance)"""
+    global _DB_INIT_DONE
+    if _DB_INIT_DONE: return
     try:
-        conn = get_conn()
-        cur  = conn.cursor()
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS scraped_jobs (
-                id          TEXT PRIMARY KEY,
-                title       TEXT,
-                company     TEXT,
-                location    TEXT,
-                county      TEXT,
-                type        TEXT,
-                sector      TEXT,
-                salary      TEXT,
-                deadline    TEXT,
-                link        TEXT,
-                apply_email TEXT,
-                description TEXT,
-                source      TEXT,
-                scraped_at  TEXT
-            );
-            CREATE TABLE IF NOT EXISTS scraper_meta (
-                key   TEXT PRIMARY KEY,
-                value TEXT
-            );
-        ''')
-        conn.commit()
-        cur.close()
-        conn.close()
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS scraped_jobs (
+                    id          TEXT PRIMARY KEY,
+                    title       TEXT,
+                    company     TEXT,
+                    location    TEXT,
+                    county      TEXT,
+                    type        TEXT,
+                    sector      TEXT,
+                    salary      TEXT,
+                    deadline    TEXT,
+                    link        TEXT,
+                    apply_email TEXT,
+                    description TEXT,
+                    source      TEXT,
+                    scraped_at  TEXT
+                );
+                CREATE TABLE IF NOT EXISTS scraper_meta (
+                    key   TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            ''')
+            conn.commit()
+            # Serves load_jobs' ORDER BY scraped_at DESC
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON scraped_jobs (scraped_at DESC)')
+            conn.commit()
+        _DB_INIT_DONE = True
         print('DB initialized')
     except Exception as e:
         print(f'init_db error: {e}')
 
-def save_jobs(jobs):
-    """Save all jobs to Neon Postgres"""
+def save_jobs(jobs, feed_cache=None):
+    """Save all jobs (and the RSS validators they were fetched with) to Neon Postgres"""
     try:
-        conn = get_conn()
-        cur  = conn.cursor()
-
-        # Clear old jobs
-        cur.execute('DELETE FROM scraped_jobs')
-
-        # Insert new jobs
-        for j in jobs:
-            cur.execute('''
-                INSERT INTO scraped_jobs
-                (id, title, company, location, county, type, sector,
-                 salary, deadline, link, apply_email, description, source, scraped_at)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                ON CONFLICT (id) DO UPDATE SET
-                    title=EXCLUDED.title, company=EXCLUDED.company,
-                    scraped_at=EXCLUDED.scraped_at
-            ''', (
+        from psycopg2.extras import execute_values
+        with get_conn() as conn, conn.cursor() as cur:
+            # Clear old jobs
+            cur.execute('DELETE FROM scraped_jobs')
+
+            # Insert new jobs in one batched statement; a repeated id keeps its
+            # last row, since one statement can't upsert the same key twice
+            rows = {j.get('id',''): (
                 j.get('id',''), j.get('title',''), j.get('company',''),
                 j.get('location',''), j.get('county',''), j.get('type',''),
                 j.get('sector',''), j.get('salary',''), j.get('deadline',''),
                 j.get('link',''), j.get('apply_email',''),
                 j.get('description','')[:2000], j.get('source',''),
                 j.get('scraped_at','')
-            ))
-
-        # Save last run time
-        now = datetime.now().isoformat()
-        cur.execute('''
-            INSERT INTO scraper_meta (key, value) VALUES ('last_run', %s)
-            ON CONFLICT (key) DO UPDATE SET value=EXCLUDED.value
-        ''', (now,))
-        cur.execute('''
-            INSERT INTO scraper_meta (key, value) VALUES ('total_jobs', %s)
-            ON CONFLICT (key) DO UPDATE SET value=EXCLUDED.value
-        ''', (str(len(jobs)),))
-
-        conn.commit()
-        cur.close()
-        conn.close()
+            ) for j in jobs}
+            execute_values(cur, '''
+                INSERT INTO scraped_jobs
+                (id, title, company, location, county, type, sector,
+                 salary, deadline, link, apply_email, description, source, scraped_at)
+                VALUES %s
+                ON CONFLICT (id) DO UPDATE SET
+                    title=EXCLUDED.title, company=EXCLUDED.company,
+                    scraped_at=EXCLUDED.scraped_at
+            ''', list(rows.values()), page_size=200)
+
+            # Save last run time
+            now = datetime.now().isoformat()
+            cur.execute('''
+                INSERT INTO scraper_meta (key, value) VALUES ('last_run', %s)
+                ON CONFLICT (key) DO UPDATE SET value=EXCLUDED.value
+            ''', (now,))
+            cur.execute('''
+                INSERT INTO scraper_meta (key, value) VALUES ('total_jobs', %s)
+                ON CONFLICT (key) DO UPDATE SET value=EXCLUDED.value
+            ''', (str(len(jobs)),))
+            if feed_cache is not None:
+                cur.execute('''
+                    INSERT INTO scraper_meta (key, value) VALUES ('feed_cache', %s)
+                    ON CONFLICT (key) DO UPDATE SET value=EXCLUDED.value
+                ''', (orjson.dumps(feed_cache).decode(),))
+
+            conn.commit()
+        _STATUS_CACHE['data'] = None
         print(f'✅ {len(jobs)} jobs saved to Neon Postgres')
         return {'total': len(jobs), 'scraped_at': now}
     except Exception as e:
@@ -99,10 +147,8 @@ def save_jobs(jobs):
 def load_jobs(county='', jtype='', keyword='', limit=80):
     """Load jobs from Neon Postgres with optional filters"""
     try:
-        conn   = get_conn()
-        cur    = conn.cursor()
-
-        query  = 'SELECT id,title,company,location,county,type,sector,salary,deadline,link,apply_email,description,source,scraped_at FROM scraped_jobs WHERE 1=1'
+        from psycopg2.extras import RealDictCursor
+        query  = f'SELECT {JOB_COLUMNS} FROM scraped_jobs WHERE 1=1'
         params = []
 
         if county:
@@ -118,97 +164,164 @@ def load_jobs(county='', jtype='', keyword='', limit=80):
         query += ' ORDER BY scraped_at DESC LIMIT %s'
         params.append(limit)
 
-        cur.execute(query, params)
-        rows = cur.fetchall()
-        cols = ['id','title','company','location','county','type','sector',
-                'salary','deadline','link','apply_email','description','source','scraped_at']
-        jobs = [dict(zip(cols, row)) for row in rows]
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params)
+            jobs = cur.fetchall()
 
-        # Get meta
-        cur.execute("SELECT value FROM scraper_meta WHERE key='last_run'")
-        row      = cur.fetchone()
-        last_run = row[0] if row else None
+            # Get meta
+            cur.execute("SELECT value FROM scraper_meta WHERE key='last_run'")
+            row      = cur.fetchone()
+            last_run = row['value'] if row else None
 
-        cur.close()
-        conn.close()
         return {'total': len(jobs), 'scraped_at': last_run, 'jobs': jobs}
     except Exception as e:
         print(f'load_jobs error: {e}')
         return {'total': 0, 'scraped_at': None, 'jobs': []}
 
+def load_feed_cache():
+    """RSS validators from the last scrape: {url: {'etag': ..., 'last_modified': ...}}"""
+    try:
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT value FROM scraper_meta WHERE key='feed_cache'")
+            row = cur.fetchone()
+        return orjson.loads(row[0]) if row else {}
+    except Exception as e:
+        print(f'load_feed_cache error: {e}')
+        return {}
+
+def cached_jobs_for(sources):
+    """source -> jobs the previous scrape saved, for feeds that came back unchanged"""
+    found = {}
+    try:
+        from psycopg2.extras import RealDictCursor
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(f'SELECT {JOB_COLUMNS} FROM scraped_jobs WHERE source = ANY(%s)', (list(sources),))
+            for row in cur.fetchall():
+                found.setdefault(row['source'], []).append(row)
+    except Exception as e:
+        print(f'cached_jobs_for error: {e}')
+    return found
+
+STATUS_TTL    = 60
+_STATUS_CACHE = {'data': None, 'ts': 0.0}
+
 def get_status():
-    """Get scraper status from DB"""
+    """Get scraper status from DB, cached per instance for STATUS_TTL seconds"""
+    if _STATUS_CACHE['data'] and time.time() - _STATUS_CACHE['ts'] < STATUS_TTL:
+        return _STATUS_CACHE['data']
     try:
-        conn = get_conn()
-        cur  = conn.cursor()
-        cur.execute("SELECT value FROM scraper_meta WHERE key='last_run'")
-        r1       = cur.fetchone()
-        cur.execute("SELECT value FROM scraper_meta WHERE key='total_jobs'")
-        r2       = cur.fetchone()
-        cur.close()
-        conn.close()
-        return {
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT value FROM scraper_meta WHERE key='last_run'")
+            r1       = cur.fetchone()
+            cur.execute("SELECT value FROM scraper_meta WHERE key='total_jobs'")
+            r2       = cur.fetchone()
+        data = {
             'status':     'ok' if r1 else 'no_data',
             'total_jobs': int(r2[0]) if r2 else 0,
             'last_run':   r1[0] if r1 else None,
         }
+        _STATUS_CACHE.update(data=data, ts=time.time())
+        return data
     except Exception as e:
         return {'status': 'error', 'error': str(e), 'total_jobs': 0, 'last_run': None}
 
 
 # ── TEXT HELPERS ─────────────────────────────────────────────────
+_HTML_RE  = re.compile(r'<[^>]+>')
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}')
+_SLUG_RE  = re.compile(r'[^a-z]')
+_BAD_EMAIL_RE  = re.compile(r'noreply|no-reply|donotreply|example|sentry|test@', re.I)
+
 def clean(t):
     return ' '.join((t or '').strip().split())
 
 def strip_html(t):
-    return re.sub(r'<[^>]+>', ' ', t or '').strip()
+    """Drop tags from a body; tag-free text skips the regex"""
+    t = t or ''
+    if '<' not in t: return t.strip()
+    return _HTML_RE.sub(' ', t).strip()
 
 def extract_email(text):
-    emails = re.findall(r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}', text or '')
-    bad    = ['noreply','no-reply','donotreply','example','sentry','test@']
-    return next((e for e in emails if not any(b in e.lower() for b in bad)), '')
-
-def extract_county(text):
-    counties = ['Nairobi','Mombasa','Kisumu','Nakuru','Eldoret','Kiambu',
-                'Machakos','Nyeri','Meru','Kakamega','Kisii','Kilifi',
-                'Embu','Garissa','Bungoma','Kajiado','Kericho','Turkana',
-                'Homa Bay','Nyamira','Narok','Vihiga','Thika','Lamu','Siaya']
-    t = (text or '').lower()
-    for c in counties:
-        if c.lower() in t:
-            return c
-    if 'remote' in t or 'online' in t:
-        return 'Remote'
-    return 'Nairobi'
-
-def detect_type(text):
-    t = (text or '').lower()
-    if any(w in t for w in ['intern','attachment','graduate trainee']): return 'Internship'
-    if any(w in t for w in ['part-time','part time','casual']):         return 'Part-Time'
-    if any(w in t for w in ['government','county','ministry','psc']):   return 'Government'
-    if any(w in t for w in ['ngo','unicef','undp','oxfam','non-profit']):return 'NGO'
-    if any(w in t for w in ['remote','work from home','wfh']):          return 'Remote'
-    if any(w in t for w in ['contract','consultant','temporary']):       return 'Contract'
-    return 'Full-Time'
-
-def detect_sector(text):
-    t = (text or '').lower()
-    if any(w in t for w in ['software','developer','ict','data','cyber','tech']): return 'ICT & Technology'
-    if any(w in t for w in ['nurse','doctor','medical','health','clinical']):     return 'Health & Medicine'
-    if any(w in t for w in ['finance','account','audit','tax','banking']):        return 'Finance & Banking'
-    if any(w in t for w in ['engineer','civil','mechanical','electrical']):       return 'Engineering'
-    if any(w in t for w in ['teach','tutor','lecturer','school','education']):    return 'Education'
-    if any(w in t for w in ['farm','agri','crop','livestock','food']):            return 'Agriculture'
-    if any(w in t for w in ['market','sales','brand','advertis']):                return 'Marketing & Sales'
-    if any(w in t for w in ['ngo','humanitarian','relief','programme']):          return 'NGO / Non-Profit'
-    if any(w in t for w in ['legal','lawyer','advocate','compliance']):           return 'Legal'
-    if any(w in t for w in ['driver','transport','logistics','supply']):          return 'Transport & Logistics'
-    return 'General'
+    """First address in the text that isn't a no-reply/placeholder one"""
+    for m in _EMAIL_RE.finditer(text or ''):
+        email = m.group(0)
+        if not _BAD_EMAIL_RE.search(email):
+            return email
+    return ''
+
+# ── CLASSIFIERS ──────────────────────────────────────────────────
+# Each field is a list of (label, keywords) rules; the first rule with a
+# keyword anywhere in the lowercased text wins, else the field default.
+COUNTIES = ['Nairobi','Mombasa','Kisumu','Nakuru','Eldoret','Kiambu',
+            'Machakos','Nyeri','Meru','Kakamega','Kisii','Kilifi',
+            'Embu','Garissa','Bungoma','Kajiado','Kericho','Turkana',
+            'Homa Bay','Nyamira','Narok','Vihiga','Thika','Lamu','Siaya']
+
+CLASSIFY_RULES = {
+    'county': [(c, [c.lower()]) for c in COUNTIES] + [
+        ('Remote',                ['remote','online']),
+    ],
+    'type': [
+        ('Internship',            ['intern','attachment','graduate trainee']),
+        ('Part-Time',             ['part-time','part time','casual']),
+        ('Government',            ['government','county','ministry','psc']),
+        ('NGO',                   ['ngo','unicef','undp','oxfam','non-profit']),
+        ('Remote',                ['remote','work from home','wfh']),
+        ('Contract',              ['contract','consultant','temporary']),
+    ],
+    'sector': [
+        ('ICT & Technology',      ['software','developer','ict','data','cyber','tech']),
+        ('Health & Medicine',     ['nurse','doctor','medical','health','clinical']),
+        ('Finance & Banking',     ['finance','account','audit','tax','banking']),
+        ('Engineering',           ['engineer','civil','mechanical','electrical']),
+        ('Education',             ['teach','tutor','lecturer','school','education']),
+        ('Agriculture',           ['farm','agri','crop','livestock','food']),
+        ('Marketing & Sales',     ['market','sales','brand','advertis']),
+        ('NGO / Non-Profit',      ['ngo','humanitarian','relief','programme']),
+        ('Legal',                 ['legal','lawyer','advocate','compliance']),
+        ('Transport & Logistics', ['driver','transport','logistics','supply']),
+    ],
+}
+CLASSIFY_DEFAULTS = {'county': 'Nairobi', 'type': 'Full-Time', 'sector': 'General'}
+
+def _build_automaton(rules):
+    """keyword -> [(field, rank, label), ...]; a keyword can tag several fields"""
+    keywords = {}
+    for field, field_rules in rules.items():
+        for rank, (label, words) in enumerate(field_rules):
+            for w in words:
+                keywords.setdefault(w, []).append((field, rank, label))
+    automaton = ahocorasick.Automaton()
+    for w, tags in keywords.items():
+        automaton.add_word(w, tags)
+    automaton.make_automaton()
+    return automaton
+
+_AUTOMATON = _build_automaton(CLASSIFY_RULES)
+
+def classify(text, pre_lowered=False):
+    """County, type and sector of a job in one Aho–Corasick pass over the text"""
+    t = (text or '') if pre_lowered else (text or '').lower()
+    best = {}
+    for _, tags in _AUTOMATON.iter(t):
+        for field, rank, label in tags:
+            if field not in best or rank < best[field][0]:
+                best[field] = (rank, label)
+    return {f: best[f][1] if f in best else d for f, d in CLASSIFY_DEFAULTS.items()}
+
+def extract_county(text, pre_lowered=False):
+    return classify(text, pre_lowered)['county']
+
+def detect_type(text, pre_lowered=False):
+    return classify(text, pre_lowered)['type']
+
+def detect_sector(text, pre_lowered=False):
+    return classify(text, pre_lowered)['sector']
 
 def deduplicate(jobs):
     seen, unique = set(), []
     for j in jobs:
-        key = f"{j.get('title','').lower()[:40]}|{j.get('company','').lower()[:25]}"
+        key = (j.get('title','').lower()[:40], j.get('company','').lower()[:25])
         if key not in seen:
             seen.add(key)
             unique.append(j)
@@ -216,8 +329,68 @@ def deduplicate(jobs):
 
 
 # ── SCRAPERS ─────────────────────────────────────────────────────
-
-def scrape_reliefweb():
+HTTP_TIMEOUT  = 25  # seconds, whole request
+HTTP_HEADERS  = {'User-Agent': 'JobsKenyaBot/1.0'}
+MAX_PARALLEL  = 8
+RETRIES       = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUS  = {429, 500, 502, 503, 504}
+
+def new_session():
+    """One pooled keep-alive session per scrape run, shared by every scraper.
+    aiohttp is imported here, not at module level, so /jobs and /status never load it."""
+    import aiohttp
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT), headers=HTTP_HEADERS)
+
+async def fetch(session, url, headers=None, sem=None):
+    """GET a URL on the shared session, returns (status, body bytes, headers)"""
+    import aiohttp
+    async with sem or nullcontext():
+        for attempt in range(RETRIES + 1):
+            try:
+                async with session.get(url, headers=headers) as res:
+                    if res.status not in RETRY_STATUS or attempt == RETRIES:
+                        return res.status, await res.read(), res.headers
+            except aiohttp.ClientConnectionError:
+                if attempt == RETRIES: raise
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+CACHE_DIR = pathlib.Path('/tmp/jk_cache')
+CACHE_TTL = 3300  # just under the hourly cron, so every tick still refetches
+
+def _store_cached(path, body):
+    """Write body under path via a temp file + rename, so a cut-off write
+    never leaves a truncated body to be replayed"""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+async def cached_fetch(session, url, headers=None, sem=None, ttl=CACHE_TTL):
+    """fetch() backed by a /tmp copy of the body reused for `ttl` seconds, so
+    cron retries and re-runs within the hour skip the network. Cache hits
+    come back as (200, body, {}). The fourth value stores a fresh 200 body;
+    call it only once the body has parsed, so a bad response is refetched."""
+    path = CACHE_DIR / hashlib.md5(url.encode()).hexdigest()
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return 200, path.read_bytes(), {}, lambda: None
+    except OSError:
+        pass
+    status, body, res_headers = await fetch(session, url, headers=headers, sem=sem)
+    keep = (lambda: _store_cached(path, body)) if status == 200 else (lambda: None)
+    return status, body, res_headers, keep
+
+async def scrape_reliefweb(session, sem=None):
     print('[ReliefWeb] Fetching NGO/UN jobs...')
     jobs = []
     try:
@@ -232,9 +405,9 @@ def scrape_reliefweb():
             '&fields[include][]=date'
             '&fields[include][]=url'
         )
-        res = requests.get(url, timeout=25)
-        if not res.ok: return []
-        for item in res.json().get('data', []):
+        status, content, _, keep = await cached_fetch(session, url, sem=sem)
+        if status >= 400: return []
+        for item in orjson.loads(content).get('data', []):
             try:
                 f       = item.get('fields', {})
                 title   = clean(f.get('title', ''))
@@ -243,13 +416,14 @@ def scrape_reliefweb():
                 company = sources[0].get('name', 'NGO') if sources else 'NGO'
                 body    = clean(strip_html(f.get('body', '')))
                 date    = f.get('date', {}).get('created', datetime.now().isoformat())
+                tags    = classify(f'{title} {body}'.lower(), pre_lowered=True)
                 jobs.append({
                     'id':          f"rw-{item.get('id', len(jobs))}",
                     'title':       title,
                     'company':     company,
-                    'location':    extract_county(title+' '+body)+', Kenya',
-                    'county':      extract_county(title+' '+body),
-                    'type':        detect_type(title+' '+body),
+                    'location':    tags['county']+', Kenya',
+                    'county':      tags['county'],
+                    'type':        tags['type'],
                     'sector':      detect_sector(title),
                     'salary':      'Not stated',
                     'deadline':    '',
@@ -260,19 +434,20 @@ def scrape_reliefweb():
                     'scraped_at':  date,
                 })
             except: continue
+        if jobs: keep()
         print(f'[ReliefWeb] ✅ {len(jobs)} jobs')
     except Exception as e:
         print(f'[ReliefWeb] ❌ {e}')
     return jobs
 
 
-def scrape_remotive():
+async def scrape_remotive(session, sem=None):
     print('[Remotive] Fetching remote jobs...')
     jobs = []
     try:
-        res = requests.get('https://remotive.com/api/remote-jobs?limit=50', timeout=25)
-        if not res.ok: return []
-        for j in res.json().get('jobs', []):
+        status, content, _, keep = await cached_fetch(session, 'https://remotive.com/api/remote-jobs?limit=50', sem=sem)
+        if status >= 400: return []
+        for j in orjson.loads(content).get('jobs', []):
             try:
                 title = clean(j.get('title', ''))
                 if not title: continue
@@ -294,35 +469,70 @@ def scrape_remotive():
                     'scraped_at':  j.get('publication_date', datetime.now().isoformat()),
                 })
             except: continue
+        if jobs: keep()
         print(f'[Remotive] ✅ {len(jobs)} jobs')
     except Exception as e:
         print(f'[Remotive] ❌ {e}')
     return jobs
 
 
-def parse_rss(name, url):
+ATOM           = '{http://www.w3.org/2005/Atom}'
+RSS_ITEM_TAGS  = ('item', 'entry', ATOM+'entry')
+RSS_FIELD_TAGS = {
+    'title':       ('title', ATOM+'title'),
+    'description': ('description', 'summary', ATOM+'summary', ATOM+'content'),
+    'link':        ('link', ATOM+'link'),
+}
+RSS_MAX_ITEMS  = 40
+
+def _first_text(children, tags):
+    """Text of the first child present under any of `tags` (Atom links use href)"""
+    for tag in tags:
+        el = children.get(tag)
+        if el is not None:
+            value = el.text or el.get('href', '')
+            if value.strip(): return clean(value)
+    return ''
+
+def _iter_rss_items(content, limit=RSS_MAX_ITEMS):
+    """Stream <item>/<entry> records out of a feed, stopping after `limit`"""
+    count = 0
+    for _, el in ET.iterparse(BytesIO(content), events=('end',), tag=RSS_ITEM_TAGS,
+                              resolve_entities=False):
+        children = {}
+        for child in el:
+            children.setdefault(child.tag, child)
+        yield {k: _first_text(children, tags) for k, tags in RSS_FIELD_TAGS.items()}
+        # Free this item and the already-read siblings still hanging off the root
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+        count += 1
+        if count >= limit: return
+
+async def parse_rss(session, name, url, sem=None, feed_cache=None):
+    """Jobs from one feed, or None when it answers 304 to the validators kept
+    in feed_cache (the caller then reuses the rows the previous scrape saved)"""
     print(f'[RSS] {name}...')
     jobs = []
     try:
-        res = requests.get(url, timeout=25, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; JobsKenyaBot/1.0)'
-        })
-        if not res.ok: return []
-        root  = ET.fromstring(res.content)
-        ns    = {'atom': 'http://www.w3.org/2005/Atom'}
-        items = root.findall('.//item') or root.findall('.//entry') or root.findall('.//atom:entry', ns)
-        for item in items[:40]:
+        # Validators go back into feed_cache only if this run writes the feed's rows
+        seen    = feed_cache.pop(url, {}) if feed_cache is not None else {}
+        headers = {'User-Agent': 'Mozilla/5.0 (compatible; JobsKenyaBot/1.0)'}
+        if seen.get('etag'):          headers['If-None-Match']     = seen['etag']
+        if seen.get('last_modified'): headers['If-Modified-Since'] = seen['last_modified']
+        status, content, res_headers, keep = await cached_fetch(session, url, sem=sem, headers=headers)
+        if status == 304:
+            feed_cache[url] = seen
+            print(f'[RSS] {name}: unchanged')
+            return None
+        if status >= 400: return []
+        for item in _iter_rss_items(content):
             try:
-                def get(tag):
-                    el = item.find(tag) or item.find(f'atom:{tag}', ns)
-                    return clean(el.text or '') if el is not None and el.text else ''
-                title = get('title')
+                title = item['title']
                 if not title or len(title) < 4: continue
-                desc    = clean(strip_html(get('description') or get('summary') or ''))
-                link    = get('link')
-                if not link:
-                    el   = item.find('link') or item.find('atom:link', ns)
-                    link = el.get('href','') if el is not None else ''
+                desc    = clean(strip_html(item['description']))
+                link    = item['link']
                 company = name
                 for sep in [' at ', ' - ', ' | ']:
                     if sep in title:
@@ -330,15 +540,16 @@ def parse_rss(name, url):
                         title   = parts[0].strip()
                         company = parts[1].strip()
                         break
-                slug = re.sub(r'[^a-z]', '', name.lower())[:6]
+                slug = _SLUG_RE.sub('', name.lower())[:6]
+                tags = classify(f'{title} {desc}'.lower(), pre_lowered=True)
                 jobs.append({
                     'id':          f"{slug}-{len(jobs)}",
                     'title':       title,
                     'company':     company,
-                    'location':    extract_county(title+' '+desc)+', Kenya',
-                    'county':      extract_county(title+' '+desc),
-                    'type':        detect_type(title+' '+desc),
-                    'sector':      detect_sector(title+' '+desc),
+                    'location':    tags['county']+', Kenya',
+                    'county':      tags['county'],
+                    'type':        tags['type'],
+                    'sector':      tags['sector'],
                     'salary':      'Not stated',
                     'deadline':    '',
                     'link':        link,
@@ -348,6 +559,11 @@ def parse_rss(name, url):
                     'scraped_at':  datetime.now().isoformat(),
                 })
             except: continue
+        if jobs: keep()
+        if feed_cache is not None and jobs:
+            # Disk-cache hits carry no headers; keep the validators they were fetched under
+            feed_cache[url] = {'etag':          res_headers.get('ETag'),
+                               'last_modified': res_headers.get('Last-Modified')} if res_headers else seen
         print(f'[RSS] {name}: ✅ {len(jobs)} jobs')
     except Exception as e:
         print(f'[RSS] {name}: ❌ {e}')
@@ -363,37 +579,119 @@ RSS_SOURCES = [
 ]
 
 
+def _prepare_db():
+    """Blocking DB setup for a scrape: ensure tables exist, read RSS validators"""
+    init_db()
+    return load_feed_cache()
+
+async def _run_all():
+    """Fetch every source concurrently, at most MAX_PARALLEL in flight.
+
+    DB setup runs on a worker thread meanwhile; only the RSS feeds wait for
+    it, since they need the validators saved by the previous run.
+    """
+    sem     = asyncio.Semaphore(MAX_PARALLEL)
+    labels  = ['ReliefWeb', 'Remotive'] + [name for name, _ in RSS_SOURCES]
+    db_prep = asyncio.ensure_future(asyncio.to_thread(_prepare_db))
+
+    async def rss(s, name, url):
+        return await parse_rss(s, name, url, sem, await db_prep)
+
+    async with new_session() as s:
+        tasks = [
+            scrape_reliefweb(s, sem),
+            scrape_remotive(s, sem),
+            *(rss(s, n, u) for n, u in RSS_SOURCES),
+        ]
+        results    = dict(zip(labels, await asyncio.gather(*tasks, return_exceptions=True)))
+        feed_cache = await db_prep
+
+        # Unchanged feeds reuse the previous run's rows, read in one query. A
+        # feed whose rows are gone (or unreadable) loses its validators and is
+        # refetched in full, so it can't stay stuck on 304s over an empty set.
+        unchanged = [label for label, res in results.items() if res is None]
+        saved     = await asyncio.to_thread(cached_jobs_for, unchanged) if unchanged else {}
+        urls      = dict(RSS_SOURCES)
+        missing   = [name for name in unchanged if not saved.get(name)]
+        for name in missing:
+            print(f'[RSS] {name}: no saved rows, refetching')
+            feed_cache.pop(urls[name], None)
+        refetched = await asyncio.gather(*(parse_rss(s, n, urls[n], sem, feed_cache) for n in missing),
+                                         return_exceptions=True)
+        results.update(saved)
+        results.update(zip(missing, refetched))
+
+    all_jobs = []
+    for label, res in results.items():
+        if isinstance(res, Exception): print(f'❌ {label}: {res}')
+        else: all_jobs.extend(res or [])
+    return all_jobs, feed_cache
+
+
 def run_all_scrapers():
     """Run all scrapers and save results to Neon Postgres"""
     print('='*50)
     print(f'🇰🇪 Scraping: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
     print('='*50)
 
-    # Ensure table exists
-    init_db()
-
-    all_jobs = []
-    try: all_jobs.extend(scrape_reliefweb())
-    except Exception as e: print(f'❌ ReliefWeb: {e}')
-
-    try: all_jobs.extend(scrape_remotive())
-    except Exception as e: print(f'❌ Remotive: {e}')
-
-    for name, url in RSS_SOURCES:
-        try: all_jobs.extend(parse_rss(name, url))
-        except Exception as e: print(f'❌ {name}: {e}')
+    all_jobs, feed_cache = asyncio.run(_run_all())
 
     before   = len(all_jobs)
     all_jobs = deduplicate(all_jobs)
     print(f'🧹 {before} → {len(all_jobs)} unique jobs')
 
-    return save_jobs(all_jobs)
+    return save_jobs(all_jobs, feed_cache)
+
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL     = 1  # per-request: cheapest CPU, still most of the size win
+GZIP_LEVEL_MAX = 9  # bodies compressed once and served many times
+CACHE_CONTROL      = 'public, max-age=60, stale-while-revalidate=3600'
+JOBS_CACHE_CONTROL = 'public, max-age=60, s-maxage=300, stale-while-revalidate=3600'  # edge-cached
+
+def status_etag(status):
+    """Weak ETag for data served between two scrapes; None if nothing scraped yet"""
+    if not status.get('last_run'): return None
+    return f'W/"{status["last_run"]}-{status.get("total_jobs", 0)}"'
+
+def cache_headers(etag, cache_control=CACHE_CONTROL):
+    return {'ETag': etag, 'Cache-Control': cache_control} if etag else {}
+
+def not_modified(handler, etag, cache_control=CACHE_CONTROL):
+    """Send 304 and return True when the client's If-None-Match covers etag"""
+    if not etag: return False
+    # Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored
+    sent = {t.strip().removeprefix('W/') for t in handler.headers.get('If-None-Match', '').split(',')}
+    if etag.removeprefix('W/') not in sent and '*' not in sent: return False
+    handler.send_response(304)
+    handler.send_header('ETag',                        etag)
+    handler.send_header('Cache-Control',               cache_control)
+    handler.send_header('Vary',                        'Accept-Encoding')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.end_headers()
+    return True
+
+def json_response(handler, data, status=200, headers=None):
+    send_json(handler, orjson.dumps(data, default=str), status, headers)
 
+def wants_gzip(handler, body):
+    """Whether body goes out gzipped: big enough, and the client accepts it"""
+    return len(body) > GZIP_MIN_BYTES and 'gzip' in handler.headers.get('Accept-Encoding', '')
 
-def json_response(handler, data, status=200):
-    body = json.dumps(data, ensure_ascii=False, default=str).encode()
+def send_json(handler, body, status=200, headers=None, gz_body=None):
+    """Write an encoded JSON body, gzipped when the client accepts it;
+    gz_body is a pre-compressed copy to reuse instead of compressing again"""
+    gzipped = wants_gzip(handler, body)
+    if gzipped:
+        body = gz_body or gzip.compress(body, compresslevel=GZIP_LEVEL)
     handler.send_response(status)
     handler.send_header('Content-Type',                 'application/json')
+    handler.send_header('Content-Length',               str(len(body)))
+    if gzipped:
+        handler.send_header('Content-Encoding',         'gzip')
+    handler.send_header('Vary',                         'Accept-Encoding')
+    for k, v in (headers or {}).items():
+        handler.send_header(k, v)
     handler.send_header('Access-Control-Allow-Origin',  '*')
     handler.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
     handler.send_header('Access-Control-Allow-Headers', 'Content-Type, X-Admin-Token')
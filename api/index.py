@@ -1,9 +1,9 @@
 from http.server import BaseHTTPRequestHandler
-import json
+import orjson
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
-        body = json.dumps({
+        body = orjson.dumps({
             'status':  'running',
             'service': '🇰🇪 Jobs Kenya API',
             'endpoints': {
@@ -11,9 +11,9 @@ class handler(BaseHTTPRequestHandler):
                 'GET  /status': 'Check scraper status',
                 'GET  /scrape': 'Trigger scrape (runs automatically every hour via cron)',
             }
-        }, indent=2)
+        }, option=orjson.OPT_INDENT_2)
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(body.encode())
+        self.wfile.write(body)
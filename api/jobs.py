@@ -1,6 +1,93 @@
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-from api.helpers import load_jobs, json_response
+from api.helpers import (load_jobs, get_status, status_etag, cache_headers, not_modified,
+                         json_response, send_json, wants_gzip, GZIP_LEVEL, GZIP_LEVEL_MAX,
+                         JOBS_CACHE_CONTROL)
+import gzip, time, orjson
+from collections import defaultdict
+from itertools import islice
+
+SNAPSHOT_TTL   = 60
+BODY_CACHE_MAX = 256  # distinct (county, type, q, limit) responses kept per snapshot
+_CACHE         = {'snap': None, 'ts': 0.0}
+
+def _build_snapshot(data):
+    """Search structures for one load_jobs() result, built once per snapshot:
+    lowercase county/type -> job positions (low-cardinality inverted indexes)
+    and each job's lowercased 'title company' for keyword scans."""
+    jobs   = data.get('jobs', [])
+    county = defaultdict(list)
+    jtype  = defaultdict(list)
+    for i, j in enumerate(jobs):
+        county[(j.get('county') or '').lower()].append(i)
+        jtype[(j.get('type') or '').lower()].append(i)
+    return {
+        'data':   data,
+        'county': dict(county),
+        'type':   dict(jtype),
+        'text':   [f"{j.get('title') or ''} {j.get('company') or ''}".lower() for j in jobs],
+        'bodies': {},
+    }
+
+def _cached_snapshot(last_run, ttl=SNAPSHOT_TTL):
+    """load_jobs() snapshot shared by warm requests. Within `ttl` it is served
+    as is; after that it is re-read only if a newer scrape (last_run) exists."""
+    snap = _CACHE['snap']
+    now  = time.time()
+    if snap and now - _CACHE['ts'] < ttl:
+        return snap
+    if not snap or not last_run or snap['data'].get('scraped_at') != last_run:
+        snap = _build_snapshot(load_jobs())
+    if snap['data'].get('scraped_at'):  # never pin an empty/failed load
+        _CACHE.update(snap=snap, ts=now)
+    return snap
+
+def _positions(index, term):
+    """Job positions whose value contains term; scans distinct values, not jobs"""
+    return {i for value, ids in index.items() if term in value for i in ids}
+
+def _matching_jobs(snap, county, jtype, keyword, limit):
+    """(total, first `limit` jobs) matching the filters: county/type via the
+    indexes, keyword by one lazy scan; matches past the limit are only counted"""
+    text = snap['text']
+    ids  = None
+    if county: ids = _positions(snap['county'], county)
+    if jtype:
+        found = _positions(snap['type'], jtype)
+        ids   = found if ids is None else ids & found
+    ids = range(len(text)) if ids is None else sorted(ids)
+    if keyword: ids = (i for i in ids if keyword in text[i])
+    ids      = iter(ids)
+    all_jobs = snap['data'].get('jobs', [])
+    jobs     = [all_jobs[i] for i in islice(ids, max(limit, 0))]
+    return len(jobs) + sum(1 for _ in ids), jobs
+
+def _response_body(snap, county, jtype, keyword, limit):
+    """Response as [json, gzipped json or None], encoded once per snapshot and
+    query. Entries live on the snapshot, so a new scrape starts an empty cache;
+    the gzip copy is only made once a client needs it (see _gzip_body)."""
+    bodies = snap['bodies']
+    # Limits past the snapshot size all give the same body; share one entry
+    limit  = max(0, min(limit, len(snap['text'])))
+    key    = (county, jtype, keyword, limit)
+    if key not in bodies:
+        total, jobs = _matching_jobs(snap, county, jtype, keyword, limit)
+        body = orjson.dumps({
+            'total':      total,
+            'scraped_at': snap['data'].get('scraped_at'),
+            'jobs':       jobs
+        }, default=str)
+        if len(bodies) >= BODY_CACHE_MAX:
+            del bodies[next(iter(bodies))]  # oldest first
+        bodies[key] = [body, None]
+    return bodies[key]
+
+def _gzip_body(entry, hot):
+    """Gzipped copy of a cached body, compressed on first use. The unfiltered
+    (hot) response gets the max level; one-off queries stay on the cheap one."""
+    if entry[1] is None:
+        entry[1] = gzip.compress(entry[0], compresslevel=GZIP_LEVEL_MAX if hot else GZIP_LEVEL)
+    return entry[1]
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -12,23 +99,25 @@ class handler(BaseHTTPRequestHandler):
             keyword = params.get('q',       [''])[0].lower()
             limit   = min(int(params.get('limit', ['80'])[0]), 200)
 
-            data = load_jobs()
-            if not data:
+            # Same scrape as the client already holds → 304, no DB hit
+            status = get_status()
+            etag   = status_etag(status)
+            if not_modified(self, etag, JOBS_CACHE_CONTROL): return
+
+            snap = _cached_snapshot(status.get('last_run'))
+            if not snap['data']:
                 json_response(self, {'total': 0, 'jobs': [], 'message': 'No jobs yet — scraper runs every hour'})
                 return
 
-            jobs = data.get('jobs', [])
-
-            # Apply filters
-            if county:  jobs = [j for j in jobs if county  in j.get('county', '').lower()]
-            if jtype:   jobs = [j for j in jobs if jtype   in j.get('type',   '').lower()]
-            if keyword: jobs = [j for j in jobs if keyword in (j.get('title','') + ' ' + j.get('company','')).lower()]
-
-            json_response(self, {
-                'total':      len(jobs),
-                'scraped_at': data.get('scraped_at'),
-                'jobs':       jobs[:limit]
-            })
+            entry   = _response_body(snap, county, jtype, keyword, limit)
+            gz_body = None
+            if wants_gzip(self, entry[0]):
+                gz_body = _gzip_body(entry, hot=not (county or jtype or keyword))
+            # Validators describe the latest scrape; only attach them when that
+            # is what this body holds, never to a failed or stale load
+            served  = snap['data'].get('scraped_at')
+            headers = cache_headers(etag, JOBS_CACHE_CONTROL) if served and served == status.get('last_run') else {}
+            send_json(self, entry[0], headers=headers, gz_body=gz_body)
         except Exception as e:
             json_response(self, {'error': str(e), 'total': 0, 'jobs': []}, 500)
 
@@ -1,11 +1,14 @@
 from http.server import BaseHTTPRequestHandler
-from api.helpers import load_jobs, json_response
+from api.helpers import get_status, status_etag, cache_headers, not_modified, json_response
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         try:
-            data = load_jobs()
-            if not data:
+            data = get_status()
+            if data['status'] == 'error':
+                json_response(self, {'status': 'error', 'error': data.get('error')}, 500)
+                return
+            if data['status'] == 'no_data':
                 json_response(self, {
                     'status':     'no_data',
                     'total_jobs': 0,
@@ -13,12 +16,14 @@ class handler(BaseHTTPRequestHandler):
                     'message':    'Scraper has not run yet — it runs every hour automatically'
                 })
                 return
+            etag = status_etag(data)
+            if not_modified(self, etag): return
             json_response(self, {
                 'status':     'ok',
-                'total_jobs': data.get('total', 0),
-                'last_run':   data.get('scraped_at'),
+                'total_jobs': data.get('total_jobs', 0),
+                'last_run':   data.get('last_run'),
                 'message':    'Scraper runs every hour via Vercel cron'
-            })
+            }, headers=cache_headers(etag))
         except Exception as e:
             json_response(self, {'status': 'error', 'error': str(e)}, 500)
 
@@ -5,79 +5,147 @@ Run by GitHub Actions every hour.
 Scrapes jobs and saves to Neon Postgres.
 """
 
-import re, os, requests, psycopg2
+import re, os, hashlib, requests, psycopg2, ahocorasick
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_values
 from datetime import datetime
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree as ET
 
 DATABASE_URL = os.environ.get('POSTGRES_URL', '')
+MAX_WORKERS    = 8
+DESC_MAX_CHARS = 2000  # descriptions are cut once, when the job is built
+
+# One pooled session for every scraper thread, so connections are kept alive
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
 
 # ── HELPERS ──────────────────────────────────────────────────────
+_TAG_RE       = re.compile(r'<[^>]+>')
+_SLUG_RE      = re.compile(r'[^a-z]')
+_EMAIL_RE     = re.compile(r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}')
+_BAD_EMAIL_RE = re.compile(r'noreply|no-reply|donotreply|example|sentry|test@', re.I)
+
 def clean(t):
     return ' '.join((t or '').strip().split())
 
 def strip_html(t):
-    return re.sub(r'<[^>]+>', ' ', t or '').strip()
+    return _TAG_RE.sub(' ', t or '').strip()
 
 def extract_email(text):
-    emails = re.findall(r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}', text or '')
-    bad    = ['noreply','no-reply','donotreply','example','sentry','test@']
-    return next((e for e in emails if not any(b in e.lower() for b in bad)), '')
+    """First address in the text that isn't a no-reply/placeholder one"""
+    for m in _EMAIL_RE.finditer(text or ''):
+        email = m.group(0)
+        if not _BAD_EMAIL_RE.search(email):
+            return email
+    return ''
+
+# Classifier rules: per field, the first (label, keywords) rule with a
+# keyword anywhere in the lowercased text wins, else the field default.
+COUNTIES = ('Nairobi','Mombasa','Kisumu','Nakuru','Eldoret','Kiambu',
+            'Machakos','Nyeri','Meru','Kakamega','Kisii','Kilifi',
+            'Embu','Garissa','Bungoma','Kajiado','Kericho','Turkana',
+            'Homa Bay','Nyamira','Narok','Vihiga','Thika','Lamu','Siaya')
+
+CLASSIFY_RULES = {
+    'county': [(c, [c.lower()]) for c in COUNTIES] + [
+        ('Remote',                ['remote','online']),
+    ],
+    'type': [
+        ('Internship',            ['intern','attachment','graduate trainee']),
+        ('Part-Time',             ['part-time','part time','casual']),
+        ('Government',            ['government','county','ministry','psc']),
+        ('NGO',                   ['ngo','unicef','undp','oxfam','non-profit']),
+        ('Remote',                ['remote','work from home','wfh']),
+        ('Contract',              ['contract','consultant','temporary']),
+    ],
+    'sector': [
+        ('ICT & Technology',      ['software','developer','ict','data','cyber','tech']),
+        ('Health & Medicine',     ['nurse','doctor','medical','health','clinical']),
+        ('Finance & Banking',     ['finance','account','audit','tax','banking']),
+        ('Engineering',           ['engineer','civil','mechanical','electrical']),
+        ('Education',             ['teach','tutor','lecturer','school','education']),
+        ('Agriculture',           ['farm','agri','crop','livestock','food']),
+        ('Marketing & Sales',     ['market','sales','brand','advertis']),
+        ('NGO / Non-Profit',      ['ngo','humanitarian','relief','programme']),
+        ('Legal',                 ['legal','lawyer','advocate','compliance']),
+        ('Transport & Logistics', ['driver','transport','logistics','supply']),
+    ],
+}
+CLASSIFY_DEFAULTS = {'county': 'Nairobi', 'type': 'Full-Time', 'sector': 'General'}
+
+def _build_automaton(rules):
+    """keyword -> [(field, rank, label), ...]; a keyword can tag several fields"""
+    keywords = {}
+    for field, field_rules in rules.items():
+        for rank, (label, words) in enumerate(field_rules):
+            for w in words:
+                keywords.setdefault(w, []).append((field, rank, label))
+    automaton = ahocorasick.Automaton()
+    for w, tags in keywords.items():
+        automaton.add_word(w, tags)
+    automaton.make_automaton()
+    return automaton
+
+_AUTOMATON = _build_automaton(CLASSIFY_RULES)
+
+def classify(text):
+    """County, type and sector of a job in one Aho–Corasick pass over the text"""
+    best = {}
+    for _, tags in _AUTOMATON.iter((text or '').lower()):
+        for field, rank, label in tags:
+            if field not in best or rank < best[field][0]:
+                best[field] = (rank, label)
+    return {f: best[f][1] if f in best else d for f, d in CLASSIFY_DEFAULTS.items()}
 
 def extract_county(text):
-    counties = ['Nairobi','Mombasa','Kisumu','Nakuru','Eldoret','Kiambu',
-                'Machakos','Nyeri','Meru','Kakamega','Kisii','Kilifi',
-                'Embu','Garissa','Bungoma','Kajiado','Kericho','Turkana',
-                'Homa Bay','Nyamira','Narok','Vihiga','Thika','Lamu','Siaya']
-    t = (text or '').lower()
-    for c in counties:
-        if c.lower() in t:
-            return c
-    if 'remote' in t or 'online' in t:
-        return 'Remote'
-    return 'Nairobi'
+    return classify(text)['county']
 
 def detect_type(text):
-    t = (text or '').lower()
-    if any(w in t for w in ['intern','attachment','graduate trainee']): return 'Internship'
-    if any(w in t for w in ['part-time','part time','casual']):         return 'Part-Time'
-    if any(w in t for w in ['government','county','ministry','psc']):   return 'Government'
-    if any(w in t for w in ['ngo','unicef','undp','oxfam','non-profit']):return 'NGO'
-    if any(w in t for w in ['remote','work from home','wfh']):          return 'Remote'
-    if any(w in t for w in ['contract','consultant','temporary']):       return 'Contract'
-    return 'Full-Time'
+    return classify(text)['type']
 
 def detect_sector(text):
-    t = (text or '').lower()
-    if any(w in t for w in ['software','developer','ict','data','cyber','tech']): return 'ICT & Technology'
-    if any(w in t for w in ['nurse','doctor','medical','health','clinical']):     return 'Health & Medicine'
-    if any(w in t for w in ['finance','account','audit','tax','banking']):        return 'Finance & Banking'
-    if any(w in t for w in ['engineer','civil','mechanical','electrical']):       return 'Engineering'
-    if any(w in t for w in ['teach','tutor','lecturer','school','education']):    return 'Education'
-    if any(w in t for w in ['farm','agri','crop','livestock','food']):            return 'Agriculture'
-    if any(w in t for w in ['market','sales','brand','advertis']):                return 'Marketing & Sales'
-    if any(w in t for w in ['ngo','humanitarian','relief','programme']):          return 'NGO / Non-Profit'
-    if any(w in t for w in ['legal','lawyer','advocate','compliance']):           return 'Legal'
-    if any(w in t for w in ['driver','transport','logistics','supply']):          return 'Transport & Logistics'
-    return 'General'
+    return classify(text)['sector']
 
 def deduplicate(jobs):
-    seen, unique = set(), []
+    # One insertion-ordered dict instead of a set plus a list: a single
+    # probe per job, and the first job seen for a key is the one kept
+    unique = {}
     for j in jobs:
-        key = f"{j.get('title','').lower()[:40]}|{j.get('company','').lower()[:25]}"
-        if key not in seen:
-            seen.add(key)
-            unique.append(j)
-    return unique
+        key = (j.get('title','').lower()[:40], j.get('company','').lower()[:25])
+        unique.setdefault(key, j)
+    return list(unique.values())
 
 
 # ── DATABASE ─────────────────────────────────────────────────────
+_conn = None
+
 def get_conn():
-    return psycopg2.connect(DATABASE_URL, sslmode='require')
+    """One connection per run, opened lazily and shared by init_db/save_jobs"""
+    global _conn
+    if _conn is None or _conn.closed:
+        _conn = psycopg2.connect(DATABASE_URL, sslmode='require')
+    return _conn
+
+def close_conn():
+    if _conn is not None and not _conn.closed:
+        _conn.close()
 
 def init_db():
     print('Initializing database...')
     conn = get_conn()
     cur  = conn.cursor()
+    # Tables exist after the first run; skip the DDL round-trip then
+    cur.execute("SELECT to_regclass('scraped_jobs') IS NOT NULL AND to_regclass('scraper_meta') IS NOT NULL")
+    if cur.fetchone()[0]:
+        conn.commit()  # don't sit idle in a transaction while scraping
+        cur.close()
+        print('✅ Database ready')
+        return
     cur.execute('''
         CREATE TABLE IF NOT EXISTS scraped_jobs (
             id          TEXT PRIMARY KEY,
@@ -102,7 +170,6 @@ def init_db():
     ''')
     conn.commit()
     cur.close()
-    conn.close()
     print('✅ Database ready')
 
 def save_jobs(jobs):
@@ -110,25 +177,52 @@ def save_jobs(jobs):
     conn = get_conn()
     cur  = conn.cursor()
 
-    # Clear old jobs then insert fresh ones
-    cur.execute('DELETE FROM scraped_jobs')
-    for j in jobs:
-        cur.execute('''
+    # Incremental refresh: only rows whose written columns (all but
+    # scraped_at) changed are upserted, and ids no longer scraped are
+    # deleted. Feed ids are positional, so company/link/apply_email must be
+    # hashed too. The hash matches Postgres' md5() over the stored (already
+    # truncated) values joined by \x1f. A repeated id keeps its last row.
+    rows = {j.get('id',''): (
+        j.get('id',''), j.get('title',''), j.get('company',''),
+        j.get('location',''), j.get('county',''), j.get('type',''),
+        j.get('sector',''), j.get('salary',''), j.get('deadline',''),
+        j.get('link',''), j.get('apply_email',''),
+        j.get('description',''),
+        j.get('source',''), j.get('scraped_at','')
+    ) for j in jobs}
+    cur.execute("""
+        SELECT id, md5(concat_ws(E'\\x1f',
+            coalesce(title,''), coalesce(company,''), coalesce(location,''),
+            coalesce(county,''), coalesce(type,''), coalesce(sector,''),
+            coalesce(salary,''), coalesce(deadline,''), coalesce(link,''),
+            coalesce(apply_email,''), coalesce(description,''),
+            coalesce(source,'')))
+        FROM scraped_jobs
+    """)
+    existing = dict(cur.fetchall())
+    changed  = [r for id_, r in rows.items()
+                if existing.get(id_) != hashlib.md5(
+                    '\x1f'.join(v or '' for v in r[1:13]).encode()).hexdigest()]
+    stale    = [id_ for id_ in existing if id_ not in rows]
+    if changed:
+        execute_values(cur, '''
             INSERT INTO scraped_jobs
             (id,title,company,location,county,type,sector,
              salary,deadline,link,apply_email,description,source,scraped_at)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            VALUES %s
             ON CONFLICT (id) DO UPDATE SET
-                title=EXCLUDED.title,
+                title=EXCLUDED.title, company=EXCLUDED.company,
+                location=EXCLUDED.location, county=EXCLUDED.county,
+                type=EXCLUDED.type, sector=EXCLUDED.sector,
+                salary=EXCLUDED.salary, deadline=EXCLUDED.deadline,
+                link=EXCLUDED.link, apply_email=EXCLUDED.apply_email,
+                description=EXCLUDED.description, source=EXCLUDED.source,
                 scraped_at=EXCLUDED.scraped_at
-        ''', (
-            j.get('id',''), j.get('title',''), j.get('company',''),
-            j.get('location',''), j.get('county',''), j.get('type',''),
-            j.get('sector',''), j.get('salary',''), j.get('deadline',''),
-            j.get('link',''), j.get('apply_email',''),
-            j.get('description','')[:2000],
-            j.get('source',''), j.get('scraped_at','')
-        ))
+        ''', changed, page_size=500)
+    if stale:
+        cur.execute('DELETE FROM scraped_jobs WHERE id = ANY(%s)', (stale,))
+    print(f'  {len(changed)} new/changed, {len(stale)} removed, '
+          f'{len(rows) - len(changed)} unchanged')
 
     now = datetime.now().isoformat()
     cur.execute("""
@@ -142,7 +236,6 @@ def save_jobs(jobs):
 
     conn.commit()
     cur.close()
-    conn.close()
     print(f'✅ {len(jobs)} jobs saved to Neon Postgres!')
 
 
@@ -162,7 +255,7 @@ def scrape_reliefweb():
             '&fields[include][]=date'
             '&fields[include][]=url'
         )
-        res = requests.get(url, timeout=25)
+        res = _SESSION.get(url, timeout=25)
         if not res.ok:
             print(f'  HTTP {res.status_code}')
             return []
@@ -175,19 +268,20 @@ def scrape_reliefweb():
                 company = sources[0].get('name', 'NGO') if sources else 'NGO'
                 body    = clean(strip_html(f.get('body', '')))
                 date    = f.get('date', {}).get('created', datetime.now().isoformat())
+                tags    = classify(title+' '+body)
                 jobs.append({
                     'id':          f"rw-{item.get('id', len(jobs))}",
                     'title':       title,
                     'company':     company,
-                    'location':    extract_county(title+' '+body)+', Kenya',
-                    'county':      extract_county(title+' '+body),
-                    'type':        detect_type(title+' '+body),
+                    'location':    tags['county']+', Kenya',
+                    'county':      tags['county'],
+                    'type':        tags['type'],
                     'sector':      detect_sector(title),
                     'salary':      'Not stated',
                     'deadline':    '',
                     'link':        f.get('url', ''),
                     'apply_email': extract_email(body),
-                    'description': body[:2000],
+                    'description': body[:DESC_MAX_CHARS],
                     'source':      'ReliefWeb',
                     'scraped_at':  date,
                 })
@@ -202,7 +296,7 @@ def scrape_remotive():
     print('\n[2] Remotive — Remote jobs...')
     jobs = []
     try:
-        res = requests.get('https://remotive.com/api/remote-jobs?limit=50', timeout=25)
+        res = _SESSION.get('https://remotive.com/api/remote-jobs?limit=50', timeout=25)
         if not res.ok: return []
         for j in res.json().get('jobs', []):
             try:
@@ -221,7 +315,7 @@ def scrape_remotive():
                     'deadline':    '',
                     'link':        j.get('url', ''),
                     'apply_email': '',
-                    'description': desc[:2000],
+                    'description': desc[:DESC_MAX_CHARS],
                     'source':      'Remotive (Remote)',
                     'scraped_at':  j.get('publication_date', datetime.now().isoformat()),
                 })
@@ -232,58 +326,84 @@ def scrape_remotive():
     return jobs
 
 
+ATOM           = '{http://www.w3.org/2005/Atom}'
+RSS_ITEM_TAGS  = ('item', 'entry', ATOM+'entry')
+RSS_FIELD_TAGS = {
+    'title':       ('title', ATOM+'title'),
+    'description': ('description', 'summary', ATOM+'summary', ATOM+'content'),
+    'link':        ('link', ATOM+'link'),
+}
+RSS_MAX_ITEMS  = 40
+
+def _first_text(children, tags):
+    """Text of the first child present under any of `tags` (Atom links use href)"""
+    for tag in tags:
+        el = children.get(tag)
+        if el is not None:
+            value = el.text or el.get('href', '')
+            if value.strip(): return clean(value)
+    return ''
+
+def _iter_rss_items(stream, limit=RSS_MAX_ITEMS):
+    """Parse <item>/<entry> records off a feed stream as each one closes,
+    stopping after `limit` so the rest of the feed is never read"""
+    count = 0
+    for _, el in ET.iterparse(stream, events=('end',), tag=RSS_ITEM_TAGS,
+                              resolve_entities=False):
+        children = {}
+        for child in el:
+            children.setdefault(child.tag, child)
+        yield {k: _first_text(children, tags) for k, tags in RSS_FIELD_TAGS.items()}
+        # Free this item and the already-read siblings still hanging off the root
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+        count += 1
+        if count >= limit: return
+
 def parse_rss(name, url):
     print(f'\n  RSS: {name}...')
     jobs = []
     try:
-        res = requests.get(url, timeout=25, headers={
+        with _SESSION.get(url, timeout=25, stream=True, headers={
             'User-Agent': 'Mozilla/5.0 (compatible; JobsKenyaBot/1.0)'
-        })
-        if not res.ok:
-            print(f'  HTTP {res.status_code}')
-            return []
-        root  = ET.fromstring(res.content)
-        ns    = {'atom': 'http://www.w3.org/2005/Atom'}
-        items = (root.findall('.//item') or
-                 root.findall('.//entry') or
-                 root.findall('.//atom:entry', ns))
-        for item in items[:40]:
-            try:
-                def get(tag):
-                    el = item.find(tag) or item.find(f'atom:{tag}', ns)
-                    return clean(el.text or '') if el is not None and el.text else ''
-                title = get('title')
-                if not title or len(title) < 4: continue
-                desc    = clean(strip_html(get('description') or get('summary') or ''))
-                link    = get('link')
-                if not link:
-                    el   = item.find('link') or item.find('atom:link', ns)
-                    link = el.get('href','') if el is not None else ''
-                company = name
-                for sep in [' at ', ' - ', ' | ']:
-                    if sep in title:
-                        parts   = title.split(sep, 1)
-                        title   = parts[0].strip()
-                        company = parts[1].strip()
-                        break
-                slug = re.sub(r'[^a-z]', '', name.lower())[:6]
-                jobs.append({
-                    'id':          f"{slug}-{len(jobs)}",
-                    'title':       title,
-                    'company':     company,
-                    'location':    extract_county(title+' '+desc)+', Kenya',
-                    'county':      extract_county(title+' '+desc),
-                    'type':        detect_type(title+' '+desc),
-                    'sector':      detect_sector(title+' '+desc),
-                    'salary':      'Not stated',
-                    'deadline':    '',
-                    'link':        link,
-                    'apply_email': extract_email(desc),
-                    'description': desc[:2000],
-                    'source':      name,
-                    'scraped_at':  datetime.now().isoformat(),
-                })
-            except: continue
+        }) as res:
+            if not res.ok:
+                print(f'  HTTP {res.status_code}')
+                return []
+            res.raw.decode_content = True
+            for item in _iter_rss_items(res.raw):
+                try:
+                    title = item['title']
+                    if not title or len(title) < 4: continue
+                    desc    = clean(strip_html(item['description']))
+                    link    = item['link']
+                    company = name
+                    for sep in [' at ', ' - ', ' | ']:
+                        if sep in title:
+                            parts   = title.split(sep, 1)
+                            title   = parts[0].strip()
+                            company = parts[1].strip()
+                            break
+                    slug = _SLUG_RE.sub('', name.lower())[:6]
+                    tags = classify(title+' '+desc)
+                    jobs.append({
+                        'id':          f"{slug}-{len(jobs)}",
+                        'title':       title,
+                        'company':     company,
+                        'location':    tags['county']+', Kenya',
+                        'county':      tags['county'],
+                        'type':        tags['type'],
+                        'sector':      tags['sector'],
+                        'salary':      'Not stated',
+                        'deadline':    '',
+                        'link':        link,
+                        'apply_email': extract_email(desc),
+                        'description': desc[:DESC_MAX_CHARS],
+                        'source':      name,
+                        'scraped_at':  datetime.now().isoformat(),
+                    })
+                except: continue
         print(f'  ✅ {len(jobs)} jobs')
     except Exception as e:
         print(f'  ❌ {e}')
@@ -313,18 +433,16 @@ if __name__ == '__main__':
     # Setup DB
     init_db()
 
-    # Run all scrapers
+    # Run all scrapers in parallel; results are collected in submission
+    # order so dedup keeps the same winner as a sequential run
     all_jobs = []
-
-    try: all_jobs.extend(scrape_reliefweb())
-    except Exception as e: print(f'❌ ReliefWeb: {e}')
-
-    try: all_jobs.extend(scrape_remotive())
-    except Exception as e: print(f'❌ Remotive: {e}')
-
-    for name, url in RSS_SOURCES:
-        try: all_jobs.extend(parse_rss(name, url))
-        except Exception as e: print(f'❌ {name}: {e}')
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = {ex.submit(scrape_reliefweb): 'ReliefWeb',
+                   ex.submit(scrape_remotive):  'Remotive'}
+        futures.update({ex.submit(parse_rss, name, url): name for name, url in RSS_SOURCES})
+        for f, label in futures.items():
+            try: all_jobs.extend(f.result() or [])
+            except Exception as e: print(f'❌ {label}: {e}')
 
     # Deduplicate
     before   = len(all_jobs)
@@ -333,6 +451,7 @@ if __name__ == '__main__':
 
     # Save to Neon
     save_jobs(all_jobs)
+    close_conn()
 
     print('\n✅ Scraper finished successfully!')
     print('='*55)